@@ -1,11 +1,11 @@
-import sys
+from abc import ABCMeta, abstractmethod
+from collections import deque
 from event import FlowWakeEvent
 
-slow_start = "Slow Start"
-congestion_avoidance = "Congestion Avoidance"
-fast_recovery = "Fast Recovery"
+"""States of TCP Reno"""
+SLOW_START, CONGESTION_AVOIDANCE, FAST_RECOVERY = 0, 1, 2
 
-class CongestionController:
+class CongestionController(object):
     """Implements Congestion Control
 
     Attributes:
@@ -13,9 +13,11 @@ class CongestionController:
         cwnd: Congestion Window Size
         timeout: Time period after which TCP times out
         not_acknowledged: Dictionary with IDs of unacknowledged packets as key,
-            and timestamp that packet was sent as value
+            and (duplicate number, timestamp that packet was sent) as value
         timed_out: List of packets whose acknowledgements haven't been received,
             and have now timed out
+        send_order: Queue of (timestamp, ID, duplicate number) for every packet
+            sent, oldest first, used to find timed out packets
         duplicate_count: Counter of the number of duplicate acknowledgements
             we have received (to determine number of dropped packets)
         last_ack_received: ID of the last acknowledgement packet received
@@ -28,14 +30,24 @@ class CongestionController:
             
         event_scheduler: Priority queue of events to hold FlowWakeEvents
         clock: Clock for congestion controller
+        _send_packet: The controller's send_packet method, bound once for
+            the acknowledgement path
 
     """
+    __metaclass__ = ABCMeta
+    # Ordered roughly by how often each acknowledgement touches them
+    __slots__ = ('cwnd', 'ssthresh', 'duplicate_count', 'last_ack_received',
+                 'not_acknowledged', 'timed_out', 'send_order', 'retransmit',
+                 'wake_event', '_send_packet', 'timeout', 'clock', 'event_scheduler',
+                 'flow', 'window_start')
+
     def __init__(self):
         self.ssthresh = 50
         self.cwnd = 2.0
         self.timeout = 1000
         self.not_acknowledged = dict()
         self.timed_out = []
+        self.send_order = deque()
         self.duplicate_count = 0
         self.last_ack_received = -1
         self.window_start = 0
@@ -45,15 +57,36 @@ class CongestionController:
         
         self.event_scheduler = None
         self.clock = None
+        self._send_packet = self.send_packet
 
+    @abstractmethod
     def acknowledgement_received(self, packet):
-        sys.exit("Abstract method acknowledgement_received not implemented")
+        pass
 
+    @abstractmethod
     def send_packet(self):
-        sys.exit("Abstract method send_packet not implemented")
-        
+        pass
+
+    @abstractmethod
     def wake(self):
-        sys.exit("Abstract method wake not implemented")
+        pass
+
+    """Records that a packet has been sent and is awaiting acknowledgement."""
+    def _track_sent_packet(self, packet_id, dup_num):
+        sent_time = self.clock.current_time
+        self.not_acknowledged[packet_id] = (dup_num, sent_time)
+        self.send_order.append((sent_time, packet_id, dup_num))
+
+    """Moves unacknowledged packets that have timed out into `timed_out`."""
+    def _collect_timed_out_packets(self):
+        # Packets are queued in the order they were sent, so only
+        # the oldest packets need to be checked
+        while (len(self.send_order) > 0) and (self.clock.current_time - self.send_order[0][0] > self.timeout):
+            (sent_time, packet_id, dup_num) = self.send_order.popleft()
+            # Skip packets that have since been acknowledged or resent
+            if self.not_acknowledged.get(packet_id) == (dup_num, sent_time):
+                del self.not_acknowledged[packet_id]
+                self.timed_out.append((packet_id, dup_num))
         
 class CongestionControllerReno(CongestionController):
     """Implements TCP Reno
@@ -61,25 +94,28 @@ class CongestionControllerReno(CongestionController):
     Attributes:
         state: State that TCP Reno is currently in - slow start, congestion 
             avoidance, or fast recovery/fast retransmit
-        FR_packet: The packet indentifier for the packet that was sent during
-            fast recovery
+        state_handlers: Dictionary mapping each state to the method that
+            processes an acknowledgement received in that state
     """
+    __slots__ = ('state', 'state_handlers')
 
     def __init__(self):
         CongestionController.__init__(self)
-        self.state = slow_start
-        self.FR_packet = None
+        self.state = SLOW_START
+        self.state_handlers = {
+            SLOW_START: self._slow_start_ack,
+            CONGESTION_AVOIDANCE: self._congestion_avoidance_ack,
+            FAST_RECOVERY: self._fast_recovery_ack
+        }
 
     '''Processes an acknowledgement packet based on the state of TCP Reno'''
     def acknowledgement_received(self, packet):
-        
+        event_scheduler = self.event_scheduler
+        not_acknowledged = self.not_acknowledged
+        packet_id = packet.identifier
+
         # Check for any unacknowledged packets that have timed out
-        for (packet_id, dup_num) in self.not_acknowledged.keys():
-            sent_time = self.not_acknowledged[(packet_id, dup_num)]
-            time_diff = self.clock.current_time - sent_time
-            if time_diff > self.timeout:
-                del self.not_acknowledged[(packet_id, dup_num)]
-                self.timed_out.append((packet_id, dup_num))
+        self._collect_timed_out_packets()
         # If we have packets that have timed out, we want to retransmit these
         if len(self.timed_out) > 0:
             self.retransmit = True
@@ -89,95 +125,116 @@ class CongestionControllerReno(CongestionController):
                 
         # Remove the FlowWakeEvent from the event scheduler
         if self.wake_event != None:
-            self.event_scheduler.cancel_event(self.wake_event)
+            event_scheduler.cancel_event(self.wake_event)
             
         # Remove received packet from list of unacknowledged packets
-        if (packet.identifier, packet.duplicate_num) in self.not_acknowledged.keys():
-            del self.not_acknowledged[(packet.identifier, packet.duplicate_num)]
+        entry = not_acknowledged.get(packet_id)
+        if entry is not None and entry[0] == packet.duplicate_num:
+            del not_acknowledged[packet_id]
         
+        # Classify the acknowledgement by the next packet it asks for, and update
+        # the window according to the current state. Packets are sent unless this
+        # was a duplicate or stale ACK during fast recovery
+        next_id = packet.next_id
+        if next_id > self.last_ack_received:
+            # New data was acknowledged, so the chain of dupACKS is broken
+            self.last_ack_received = next_id
+            self.duplicate_count = 0
+            send = self.state_handlers[self.state](packet, False)
+        elif next_id == self.last_ack_received:
+            self.duplicate_count += 1
+            send = self.state_handlers[self.state](packet, True)
+        else:
+            # This ACK was overtaken by a later one, so it tells us nothing new
+            # about the window, but its packet has still left the network.
+            # During fast recovery, sending would only retransmit the lost
+            # packet again, so wait for a duplicate or new ACK instead
+            send = self.state != FAST_RECOVERY
+        if send:
+            self._send_packet()
+        self.wake_event = event_scheduler.delay_event(self.timeout, FlowWakeEvent(self.flow))
+
+    """Handles an acknowledgement during slow start. Returns whether packets should be sent."""
+    def _slow_start_ack(self, packet, is_duplicate):
+        # A duplicate acknowledgement signals a lost packet, so don't grow the window
+        if is_duplicate:
+            self._duplicate_ack(packet)
+            return True
         # In slow start phase, increase congestion window size by 1
-        if self.state == slow_start:
-            self.cwnd += 1
-            # If congestion window becomes larger than slow start threshold,
-            # switch to congestion avoidance phase
-            if self.cwnd >= self.ssthresh:
-                self.state = congestion_avoidance
-        elif self.state == congestion_avoidance:
-            # Check if this is a duplicate acknowledgement
-            if packet.next_id == self.last_ack_received:
-                self.duplicate_count += 1
-                # After 3 duplicate acknowledgements, if the packet has not
-                # already been received, halve the congestion window size and
-                # move into fast recovery phase
-                if (self.duplicate_count == 3) and (packet.next_id in [key[0] for key in self.not_acknowledged.keys()]):
-                    self.cwnd /= 2
-                    self.ssthresh = self.cwnd
-                    self.state = fast_recovery
-            # This is not a duplicate acknowledgement
-            else:
-                self.cwnd += 1 / self.cwnd
-                # reset duplicate count since the chain of dupACKS is broken
-                self.duplicate_count = 0
-        elif self.state == fast_recovery:
-            # Check if this is a duplicate acknowledgement
-            if packet.next_id == self.last_ack_received:
-                self.duplicate_count += 1
-                self.wake_event = self.event_scheduler.delay_event(self.timeout, FlowWakeEvent(self.flow))
-                return
-            else:
-                # check if this is the ACK for the packet transmitted during Fast Recovery
-                if packet.identifier == self.FR_packet:
-                    self.cwnd = self.ssthresh
-                    self.state = congestion_avoidance
-                # reset duplicate count since the chain of dupACKS is broken
-                self.duplicate_count = 0
-
-        self.last_ack_received = packet.next_id
-                    
-        self.send_packet()
-        self.wake_event = self.event_scheduler.delay_event(self.timeout, FlowWakeEvent(self.flow))
+        self.cwnd += 1
+        # If congestion window becomes larger than slow start threshold,
+        # switch to congestion avoidance phase
+        if self.cwnd >= self.ssthresh:
+            self.state = CONGESTION_AVOIDANCE
+        return True
+
+    """Handles an acknowledgement during congestion avoidance. Returns whether packets should be sent."""
+    def _congestion_avoidance_ack(self, packet, is_duplicate):
+        if is_duplicate:
+            self._duplicate_ack(packet)
+        else:
+            cwnd = self.cwnd
+            self.cwnd = cwnd + 1 / cwnd
+        return True
+
+    """Handles a duplicate acknowledgement during slow start or congestion avoidance."""
+    def _duplicate_ack(self, packet):
+        # After 3 duplicate acknowledgements, if the packet has not
+        # already been received, halve the slow start threshold and move
+        # into fast recovery phase
+        if (self.duplicate_count == 3) and (packet.next_id in self.not_acknowledged):
+            ssthresh = self.cwnd / 2
+            self.ssthresh = ssthresh
+            # The window is inflated by the 3 packets that have left the network.
+            # This is only nominal: fast recovery retransmits just the lost packet
+            # and deflates the window on exit, so the inflation only survives
+            # if the flow times out during fast recovery
+            self.cwnd = ssthresh + 3
+            self.state = FAST_RECOVERY
+
+    """Handles an acknowledgement during fast recovery. Returns whether packets should be sent."""
+    def _fast_recovery_ack(self, packet, is_duplicate):
+        if is_duplicate:
+            return False
+        # New data was acknowledged, so deflate the window and
+        # return to congestion avoidance
+        self.cwnd = self.ssthresh
+        self.state = CONGESTION_AVOIDANCE
+        return True
 
     '''Determines which packet should be sent, depending on the phase of TCP Reno'''
     def send_packet(self):
-        if self.state == slow_start or self.state == congestion_avoidance:
+        if self.state != FAST_RECOVERY:
             if self.retransmit == True:
                 # Retransmit timed out packets
                 while (len(self.not_acknowledged) < self.cwnd) and (len(self.timed_out) > 0):
                     (packet_id, dup_num) = self.timed_out[0]
-                    self.not_acknowledged[(packet_id, dup_num + 1)] = self.clock.current_time
+                    self._track_sent_packet(packet_id, dup_num + 1)
                     self.flow.send_a_packet(packet_id, dup_num + 1)
                     del self.timed_out[0]
             # Send packets, without exceeding congestion window size
             else:
                 while (len(self.not_acknowledged) < self.cwnd) and (self.window_start * 1024 < self.flow.total):
-                    self.not_acknowledged[(self.window_start, 0)] = self.clock.current_time
+                    self._track_sent_packet(self.window_start, 0)
                     self.flow.send_a_packet(self.window_start, 0)
                     self.window_start += 1
         # Send dropped packet
         else:
             packet_id = self.last_ack_received
-            self.FR_packet = packet_id
-            keys = [key for key in self.not_acknowledged.keys() if key[0] == packet_id]
-            if len(keys) == 1:
-                dup_num = keys[0][1]
-                del self.not_acknowledged[(packet_id, dup_num)]
-                self.not_acknowledged[(packet_id, dup_num + 1)] = self.clock.current_time
+            if packet_id in self.not_acknowledged:
+                (dup_num, _) = self.not_acknowledged[packet_id]
+                self._track_sent_packet(packet_id, dup_num + 1)
                 self.flow.send_a_packet(packet_id, dup_num + 1)
     
     '''Start sending packets when congestion control first begins or if the flow times out'''
     def wake(self):
         # Change from fast recovery to slow start phase
-        if self.state == fast_recovery:
-            self.state = slow_start
+        if self.state == FAST_RECOVERY:
+            self.state = SLOW_START
         else:       
             self.cwnd /= 2
         # Keep track of timed out packets
-        for (packet_id, dup_num) in self.not_acknowledged.keys():
-            sent_time = self.not_acknowledged[(packet_id, dup_num)]
-            time_diff = self.clock.current_time - sent_time
-            if time_diff > self.timeout:
-                del self.not_acknowledged[(packet_id, dup_num)]
-                self.timed_out.append((packet_id, dup_num))
+        self._collect_timed_out_packets()
         if len(self.timed_out) > 0:
             self.retransmit = True
         else:
@@ -186,9 +243,9 @@ class CongestionControllerReno(CongestionController):
         self.wake_event = self.event_scheduler.delay_event(self.timeout, FlowWakeEvent(self.flow))       
 
     def __str__(self):
-        return ("ssthresh:    " + str(self.ssthresh) + "\n"
-                "cwnd:        " + str(self.cwnd) + "\n"
-                "duplicate ACKS" + str(self.duplicate_count) + "\n")
+        return ("ssthresh:    {0}\n"
+                "cwnd:        {1}\n"
+                "duplicate ACKS{2}\n").format(self.ssthresh, self.cwnd, self.duplicate_count)
 
 class CongestionControllerFast(CongestionController):
     """Implements TCP Fast
@@ -198,6 +255,8 @@ class CongestionControllerFast(CongestionController):
         base_RTT: The minimum RTT encountered
     """
 
+    __slots__ = ('alpha', 'base_RTT')
+
     def __init__(self):
         CongestionController.__init__(self)
         self.alpha = 50.0
@@ -205,29 +264,33 @@ class CongestionControllerFast(CongestionController):
     
     '''Processes an acknowledgement packet and update window size for FAST TCP'''
     def acknowledgement_received(self, packet):	
+        not_acknowledged = self.not_acknowledged
+        packet_id = packet.identifier
+        next_id = packet.next_id
+
         if self.wake_event != None:
             self.event_scheduler.cancel_event(self.wake_event)
         
         # Check if this is a duplicate acknowledgement
-        if self.last_ack_received == packet.next_id:
+        if self.last_ack_received == next_id:
             self.duplicate_count += 1
-            keys = [key for key in self.not_acknowledged.keys() if key[0] == packet.next_id]
             # After 3 duplicate acknowledgements, if the packet has not
             # already been received, it has been dropped so it needs to be re-sent
-            if (self.duplicate_count == 3) and (len(keys) > 0):
-                expected = keys[0]
-                del self.not_acknowledged[(packet.next_id, expected[1])]
-                self.timed_out.append((packet.next_id, expected[1]))
+            if (self.duplicate_count == 3) and (next_id in not_acknowledged):
+                (dup_num, _) = not_acknowledged[next_id]
+                del not_acknowledged[next_id]
+                self.timed_out.append((next_id, dup_num))
         else:
             # reset duplicate count since the chain of dupACKS is broken
             self.duplicate_count = 0
 
-        self.last_ack_received = packet.next_id
+        self.last_ack_received = next_id
 
         # This acknowledgement is for an unacknowledged packet
-        if (packet.identifier, packet.duplicate_num) in self.not_acknowledged.keys():
+        entry = not_acknowledged.get(packet_id)
+        if entry is not None and entry[0] == packet.duplicate_num:
             # calculate RTT of this packet
-            rtt = self.clock.current_time - self.not_acknowledged[(packet.identifier, packet.duplicate_num)]
+            rtt = self.clock.current_time - entry[1]
             # first packet, initialize base_RTT
             if self.base_RTT == -1:
                 self.base_RTT = rtt
@@ -237,22 +300,17 @@ class CongestionControllerFast(CongestionController):
             if rtt < self.base_RTT:
                 self.base_RTT = rtt
             # Remove received packet from list of unacknowledged packets
-            del self.not_acknowledged[(packet.identifier, packet.duplicate_num)]
+            del not_acknowledged[packet_id]
 
         # Check for any unacknowledged packets that have timed out
-        for (packet_id, dup_num) in self.not_acknowledged.keys():
-            sent_time = self.not_acknowledged[(packet_id, dup_num)]
-            time_diff = self.clock.current_time - sent_time
-            if time_diff > self.timeout:
-                del self.not_acknowledged[(packet_id, dup_num)]
-                self.timed_out.append((packet_id, dup_num))
+        self._collect_timed_out_packets()
         if len(self.timed_out) > 0:
             self.retransmit = True
             self.cwnd /= 2
         else:
             self.retransmit = False
 
-        self.send_packet()
+        self._send_packet()
         self.wake_event = self.event_scheduler.delay_event(self.timeout, FlowWakeEvent(self.flow))
 
     '''Sends packets while the number of packets in transit is within the window size'''
@@ -261,35 +319,30 @@ class CongestionControllerFast(CongestionController):
             # send timed out packets. Their duplicate number will be incremented
             while (len(self.not_acknowledged) < self.cwnd) and (len(self.timed_out) > 0):
                 (packet_id, dup_num) = self.timed_out[0]
-                self.not_acknowledged[(packet_id, dup_num + 1)] = self.clock.current_time
+                self._track_sent_packet(packet_id, dup_num + 1)
                 self.flow.send_a_packet(packet_id, dup_num + 1)
                 del self.timed_out[0]
         else:
             # send new packets
             while (len(self.not_acknowledged) < self.cwnd) and (self.window_start * 1024 < self.flow.total):
-                self.not_acknowledged[(self.window_start, 0)] = self.clock.current_time
+                self._track_sent_packet(self.window_start, 0)
                 self.flow.send_a_packet(self.window_start, 0)
                 self.window_start += 1
 
     '''Start sending packets when congestion control first begins or if the flow times out'''
     def wake(self):
         # Check for any unacknowledged packets that have timed out
-        for packet_id in self.not_acknowledged.keys():
-            sent_time = self.not_acknowledged[packet_id]
-            time_diff = self.clock.current_time - sent_time
-            if time_diff > self.timeout:
-                del self.not_acknowledged[packet_id]
-                self.timed_out.append(packet_id)
-            if len(self.timed_out) > 0:
-                self.retransmit = True
-            else:
-                self.retransmit = False
+        self._collect_timed_out_packets()
+        if len(self.timed_out) > 0:
+            self.retransmit = True
+        else:
+            self.retransmit = False
                 
         self.cwnd /= 2
         self.send_packet() 
         self.wake_event = self.event_scheduler.delay_event(self.timeout, FlowWakeEvent(self.flow))    
 
     def __str__(self):
-        return ("ssthresh:    " + str(self.ssthresh) + "\n"
-                "cwnd:        " + str(self.cwnd) + "\n"
-                "alpha:    " + str(self.alpha) + "\n")
+        return ("ssthresh:    {0}\n"
+                "cwnd:        {1}\n"
+                "alpha:    {2}\n").format(self.ssthresh, self.cwnd, self.alpha)
@@ -1,11 +1,12 @@
 import sys
 
-class Device:
+class Device(object):
     """A network device
 
     Attributes:
         identifier: The unique identification of the device
     """
+    __slots__ = ('identifier',)
 
     def __init__(self, identifier):
         self.identifier = identifier
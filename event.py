@@ -4,6 +4,9 @@
 
 import sys
 
+"""The wait time, in milliseconds, between sending out each routing update packet"""
+ROUTING_UPDATE_PERIOD = 3000
+
 class Event:
     """Function implemented by concrete base classes of Event to perform their function.
 
@@ -69,17 +72,22 @@ class FlowWakeEvent(Event):
 
 class RoutingUpdateEvent(Event):
     """This event triggers a routing table update by instructing
-       its associated host to send a routing packet.
+       every host to send a routing packet, and then reschedules
+       itself for the next update.
 
     Attributes:
-        host: the host for which the routing information needs be updated
+        hosts: list of the hosts whose routing information needs be updated
+        event_queue: the queue on which the next update is scheduled
     """
-    def __init__(self, host):
+    def __init__(self, hosts, event_queue):
         Event.__init__(self)
-        self.host = host
+        self.hosts = hosts
+        self.event_queue = event_queue
 
     def perform(self):
-        self.host.send_routing_packet()
+        for host in self.hosts:
+            host.send_routing_packet()
+        self.event_queue.delay_event(ROUTING_UPDATE_PERIOD, RoutingUpdateEvent(self.hosts, self.event_queue))
 
 class PrintElapsedSimulationTimeEvent(Event):
     """This event is scheduled every 0.2 seconds (in simulation time) and updates
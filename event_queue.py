@@ -1,21 +1,21 @@
-import Queue, heapq
+import heapq
 
 class EventQueue:
     """A queue that allows scheduling of events at a given time, and dequeues events in the correct
        order, updating the global clock.
         
         Attributes:
-        _priority_queue: The interal queue used to store the events.
+        _priority_queue: The interal heap of (time, event) tuples used to store the events.
     """
 
     def __init__(self, clock):
-        self._priority_queue = Queue.PriorityQueue()
+        self._priority_queue = []
         self.clock = clock
 
     """Schedules `event` to occur at `time` and returns an event identifier."""
     def schedule_event(self, time, event):
         assert time >= self.clock.current_time
-        self._priority_queue.put((time, event))
+        heapq.heappush(self._priority_queue, (time, event))
         return event
 
     """Schedules `event` to occur at `delay` milliseconds after the current time
@@ -27,11 +27,12 @@ class EventQueue:
     def cancel_event(self, event):
         event.is_canceled = True
 
-    """Removes next event from queue, updates the global time, and returns the event."""
+    """Removes next event from queue, updates the global time, and returns the event.
+       Raises IndexError if the queue is empty."""
     def dequeue_next_event(self):
         (time, event) = (None, None)
         while event is None or event.is_canceled:
-            (time, event) = self._priority_queue.get_nowait()
+            (time, event) = heapq.heappop(self._priority_queue)
         assert time >= self.clock.current_time
         self.clock.current_time = time
         return event
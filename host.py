@@ -1,12 +1,13 @@
 import sys
+from itertools import cycle
 from device import Device
-from packet import StandardPacket, PayloadPacket, AcknowledgementPacket, RoutingPacket
-from event import RoutingUpdateEvent
+from packet import PayloadPacket, AcknowledgementPacket, RoutingPacket
 from packet_tracker import PacketTracker
 import sys
 
-"""The wait time, in milliseconds, between sending out each routing update packet"""
-ROUTING_UPDATE_PERIOD = 3000
+"""The number of routing packets each host reuses in turn. A routing packet finishes
+   propagating well within one period, so it is never still in flight when reused."""
+ROUTING_PACKET_POOL_SIZE = 4
 
 class Host(Device):
     """A host
@@ -14,22 +15,31 @@ class Host(Device):
     Attributes:
         identifier: The unique identification of the host
         link: The Link that is attached to the host
-        flows: An dictionary of the flows associated with a given host, keyed by identifier
+        acknowledgement_handlers: A dictionary of the bound acknowledgement_received
+            methods of the flows sending from the host, keyed by flow identifier
         clock: The global clock used by the simulation
-        event_schedluer: The event_scheduler that is used to schedule events 
         logger: The global logger
         payload_packet_trackers: A dictionary of trackers used to tracked received
             payload packets, keyed by flow identifier
+        packet_handlers: A dictionary of the methods used to handle received
+            packets other than acknowledgements, keyed by packet type
+        routing_packets: An endless cycle over the host's pool of RoutingPackets
     """
+    __slots__ = ('link', 'acknowledgement_handlers', 'clock', 'logger',
+                 'payload_packet_trackers', 'packet_handlers', 'routing_packets')
 
     def __init__(self, identifier):
         Device.__init__(self, identifier)
         self.link = None
-        self.flows = {}
+        self.acknowledgement_handlers = {}
         self.clock = None
-        self.event_scheduler = None
         self.logger = None
         self.payload_packet_trackers = {}
+        self.packet_handlers = {
+            RoutingPacket: self._routing_packet_received,
+            PayloadPacket: self._payload_received
+        }
+        self.routing_packets = cycle([RoutingPacket(self, 0, 64) for _ in range(ROUTING_PACKET_POOL_SIZE)])
 
     def __str__(self):
         return "Host ID  " + self.identifier
@@ -43,37 +53,39 @@ class Host(Device):
         # Send packet across link
         self.link.send_packet(packet, self)
 
-    """Account for the received payload packet, and send a suitable acknlowedgmenet."""
+    """Ignore the received routing packet."""
+    def _routing_packet_received(self, packet):
+        # Should only happen if two hosts are directly connected by a link
+        # since Routers don't forward routing packets to Hosts.
+        pass
+
+    """Account for the received payload packet, and send a suitable acknlowedgmenet
+       across the same link."""
     def _payload_received(self, packet):
-        assert isinstance(packet, PayloadPacket)
+        assert packet.destination == self
         if packet.flow_id not in self.payload_packet_trackers:
             self.payload_packet_trackers[packet.flow_id] = PacketTracker()
         ack_tracker = self.payload_packet_trackers[packet.flow_id]
         ack_tracker.account_for_packet(packet.identifier)
-        return packet.acknowledgement(ack_tracker.next_packet)
+        self.link.send_packet(packet.acknowledgement(ack_tracker.next_packet), self)
 
     """Called to deliver a packet to this host.
        RoutingPackets are ignored; StandardPackets are delivered to the host."""
     def handle_packet(self, packet, from_link):
-        if isinstance(packet, RoutingPacket):
-            # Should only happen if two hosts are directly connected by a link
-            # since Routers don't forward routing packets to Hosts.
+        # Acknowledgements are the most common packet, so notify the
+        # flow directly so it can do the bookkeeping
+        if packet.__class__ is AcknowledgementPacket:
+            self.acknowledgement_handlers[packet.flow_id](packet)
             return
+        handler = self.packet_handlers.get(packet.__class__)
+        if handler is None:
+            sys.exit("Host doesn't know how to handle packet of type " + packet.__class__.__name__)
+        handler(packet)
 
-        assert isinstance(packet, StandardPacket)
-        assert packet.destination == self
-        # - If this packet is an acknowledgment packet,
-        #   notify flow so it can do the bookkeeping
-        # - If this packet is a payload packet, respond
-        #   by sending an acknowledgement packet across
-        #   the same link
-        if isinstance(packet, PayloadPacket):
-            ack_packet = self._payload_received(packet)
-            self.link.send_packet(ack_packet, self)
-        elif isinstance(packet, AcknowledgementPacket):
-            self.flows[packet.flow_id].acknowledgement_received(packet)
-        else:
-            sys.exit("Host doesn't know how to handle packet of type " + type(packet).__name__)
+    """Called during parsing to register a flow that sends from this host."""
+    def attach_flow(self, flow):
+        assert flow.source == self
+        self.acknowledgement_handlers[flow.identifier] = flow.acknowledgement_received
 
     """Called during parsing to set up network graph."""
     def attach_link(self, link):
@@ -82,8 +94,8 @@ class Host(Device):
         else:
             sys.exit("Illegal to attach multiple links to a host")
 
-    """Called by RoutingUpdateEvent to trigger sending a routing packet,
-       and then reschedules a RoutingUpdateEvent."""
+    """Called by RoutingUpdateEvent to trigger sending a routing packet."""
     def send_routing_packet(self):
-        self.send_packet(RoutingPacket(self, self.clock.current_time, 64))
-        self.event_scheduler.delay_event(ROUTING_UPDATE_PERIOD, RoutingUpdateEvent(self))
+        packet = next(self.routing_packets)
+        packet.timestamp = self.clock.current_time
+        self.send_packet(packet)
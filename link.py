@@ -1,6 +1,6 @@
 from __future__ import division
 import sys
-import Queue
+from collections import deque
 from event import LinkReadyEvent, PacketArrivalEvent
 
 class Buffer:
@@ -9,14 +9,14 @@ class Buffer:
     Attributes:
         available_space: how much space in the buffer is free, in bytes
         link: the link this buffer belongs to
-        queue: the Queue of packets waiting in the buffer
+        queue: the FIFO deque of packets waiting in the buffer
         logger: the Logger used by the buffer
     """
 
     def __init__(self, size, link):
         self.available_space = size
         self.link = link
-        self.queue = Queue.Queue()
+        self.queue = deque()
         self.logger = None
 
     def set_logger(self, logger):
@@ -26,7 +26,7 @@ class Buffer:
     """Places a packet in the buffer, or drops the packet if no space is available."""
     def put(self, packet, destination):
         if self.available_space >= packet.size:
-            self.queue.put((packet, destination))
+            self.queue.append((packet, destination))
             self.available_space -= packet.size
             self.logger.log_link_buffer_available_space(self.link.identifier, self.available_space)
         # Otherwise, drop the packet
@@ -35,7 +35,7 @@ class Buffer:
 
     """Retrieves the next packet from the buffer in FIFO order."""
     def get(self):
-        (packet, destination) = self.queue.get_nowait()
+        (packet, destination) = self.queue.popleft()
         self.available_space += packet.size
         self.logger.log_link_buffer_available_space(self.link.identifier, self.available_space)
         return (packet, destination)
@@ -115,10 +115,8 @@ class Link:
     # Called by LinkReadyEvent when the link is no longer busy
     def wake(self):
         self.busy = False
-        try:
-            # If there are any packets in the buffer, send one
+        # If there are any packets in the buffer, send one
+        if len(self.buffer.queue) > 0:
             (packet, destination) = self.buffer.get()
             self._send_packet_now(packet, destination)
             self.logger.log_link_sent_packet_from_buffer(self.identifier, packet)
-        except Queue.Empty:
-            pass
@@ -1,4 +1,4 @@
-class StandardPacket():
+class StandardPacket(object):
     """A packet for sending information between hosts on the network.
        Superclass of PayloadPacket and AcknowledgementPacket.
 
@@ -10,6 +10,7 @@ class StandardPacket():
         destination: The host to which the packet was sent
         size: The packet size, in bytes
     """
+    __slots__ = ('size', 'identifier', 'duplicate_num', 'flow_id', 'source', 'destination')
 
     def __init__(self, identifier, duplicate_num, flow_id, source, destination, size):
         self.size = size
@@ -31,6 +32,7 @@ class PayloadPacket(StandardPacket):
         destination: The host to which the packet was sent
         size: The packet size, in bytes
     """
+    __slots__ = ('ack_size',)
 
     def __init__(self, identifier, duplicate_num, flow_id, source, destination, payload_size, ack_size):
         StandardPacket.__init__(self, identifier, duplicate_num, flow_id, source, destination, payload_size)
@@ -61,6 +63,7 @@ class AcknowledgementPacket(StandardPacket):
         destination: The host to which the packet was sent
         size: The packet size, in bytes
     """
+    __slots__ = ('payload_size', 'next_id')
 
     def __init__(self, identifier, duplicate_num, next_id, flow_id, source, destination, payload_size, ack_size):
         StandardPacket.__init__(self, identifier, duplicate_num, flow_id, source, destination, ack_size)
@@ -75,7 +78,7 @@ class AcknowledgementPacket(StandardPacket):
                 "destination:           " + self.destination.identifier + "\n"
                 "size:                  " + str(self.size) + " bytes\n")
 
-class RoutingPacket:
+class RoutingPacket(object):
     """A packet for communicating routing information between routers on
        the network such that routing tables can be updated in a distributed
        manner.
@@ -85,6 +88,7 @@ class RoutingPacket:
         timestamp: The time at which the host sent the packet
         size: The packet size, in bytes
     """
+    __slots__ = ('size', 'source', 'timestamp')
 
     def __init__(self, source, timestamp, size):
         self.size = size
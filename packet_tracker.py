@@ -1,40 +1,44 @@
-import Queue
-
-class PacketTracker:
+class PacketTracker(object):
     """Tracks the packets that have been received before a packet with a
        smaller id, and keeps track of the packet with the smallest id number
        that is expected next.
     
     Attributes:
         next_packet: Identifier of next expected packet
-        early_packets: Ordered array holding packets that arrived out of order,
+        early_packets: Set holding packets that arrived out of order,
             specifically, recieved packets with ids greater than `next_packet`
     """
+    __slots__ = ('next_packet', 'early_packets')
 
     def __init__(self):
         self.next_packet = 0
-        self.early_packets = Queue.PriorityQueue()
+        self.early_packets = set()
 
     """Account that a packet has been recieved by updating internal variables."""
     # Called by flow when an acknowledgement has been received
     def account_for_packet(self, packet_id):
+        next_packet = self.next_packet
         # The acknowledgement we just received is for the packet that 
         # we were expecting, so update the next packet
-        if packet_id == self.next_packet:
-            self.next_packet += 1
+        if packet_id == next_packet:
+            next_packet += 1
             # If our new next packet has already been received (in the early 
-            # packets queue), we want to find the subsequent packet that hasn't 
-            # been received yet
-            while not self.early_packets.empty() and self.next_packet == self.early_packets.queue[0]:
-                self.next_packet += 1
-                self.early_packets.get_nowait()
+            # packets set), we want to find the subsequent packet that hasn't 
+            # been received yet. Packets usually arrive in order, so check
+            # whether any arrived early before probing the set.
+            early_packets = self.early_packets
+            if early_packets:
+                while next_packet in early_packets:
+                    early_packets.remove(next_packet)
+                    next_packet += 1
+            self.next_packet = next_packet
         # Packet of larger id arrived before the next packet we were expecting
-        elif packet_id > self.next_packet:
-            self.early_packets.put(packet_id)
+        elif packet_id > next_packet:
+            self.early_packets.add(packet_id)
         else:
             pass
             #received packet again - do nothing
 
     """The total number of packets accounted for, disregarding duplicates."""
     def total_count_received(self):
-        return self.next_packet + len(self.early_packets.queue)
+        return self.next_packet + len(self.early_packets)
@@ -28,12 +28,14 @@ def generate_simulation_from_testcase(input_dict, verbose, fast_insteadof_reno):
     for r in routers_info:
         routers[r["id"]] = Router(r["id"])
 
+    # Hosts and routers can both be link endpoints
+    devices = dict(hosts)
+    devices.update(routers)
+
     links = {}
     for l in links_info:
-        deviceA_id = l["endpoints"][0]
-        deviceB_id = l["endpoints"][1]
-        deviceA = [ d.get(deviceA_id) for d in [hosts, routers] if deviceA_id in d ][0]
-        deviceB = [ d.get(deviceB_id) for d in [hosts, routers] if deviceB_id in d ][0]
+        deviceA = devices[l["endpoints"][0]]
+        deviceB = devices[l["endpoints"][1]]
         link = Link(l["id"], l["rate"] * BYTES_PER_MEGABIT / 1000, l["delay"], l["buffer"] * BYTES_PER_KILOBYTE, deviceA, deviceB)
         deviceA.attach_link(link)
         deviceB.attach_link(link)
@@ -49,6 +51,6 @@ def generate_simulation_from_testcase(input_dict, verbose, fast_insteadof_reno):
         flow = Flow(f["id"], source, destination, f["amount"] * BYTES_PER_MEGABYTE, f["start"] * 1000, controller)
         controller.flow = flow
         flows[f["id"]] = flow
-        source.flows[f["id"]] = flow
+        source.attach_flow(flow)
 
     return Simulation(links, flows, hosts, routers, verbose, fast_insteadof_reno) # verbose
@@ -43,6 +43,7 @@ class Router(Device):
         routing_table: The instance of RoutingTable
         logger: the Logger to be used
     """
+    __slots__ = ('routing_table', 'links', 'logger')
 
     def __init__(self, identifier):
         Device.__init__(self, identifier)
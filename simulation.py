@@ -1,4 +1,4 @@
-import sys, Queue
+import sys
 import stats
 from event import Event, FlowWakeEvent, RoutingUpdateEvent, PrintElapsedSimulationTimeEvent
 from logger import Logger
@@ -33,7 +33,7 @@ class Simulation:
 
         # Set up event schedulers
         self.event_queue = EventQueue(self.clock)
-        for flow in flows.values() + links.values() + hosts.values():
+        for flow in flows.values() + links.values():
             flow.event_scheduler = self.event_queue
         for flow in flows.values():
             flow.controller.event_scheduler = self.event_queue
@@ -41,8 +41,7 @@ class Simulation:
         # Set up initial events
         for flow in flows.values():
             self.event_queue.delay_event(flow.start_time, FlowWakeEvent(flow))
-        for host in hosts.values():
-            self.event_queue.delay_event(0, RoutingUpdateEvent(host))
+        self.event_queue.delay_event(0, RoutingUpdateEvent(hosts.values(), self.event_queue))
 
         # Set up logging
         self.logger = Logger(self.clock, verbose, fast_insteadof_reno)
@@ -59,10 +58,10 @@ class Simulation:
     def step(self):
         try:
             event = self.event_queue.dequeue_next_event()
-            event.perform()
-            return True
-        except Queue.Empty:
+        except IndexError:
             return False
+        event.perform()
+        return True
 
     """Determines whether all flows have been completed."""
     def all_flows_finished(self):